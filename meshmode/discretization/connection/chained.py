@@ -226,8 +226,8 @@ def flatten_chained_connection(actx, connection):
         grp_to_grp, batch_info = _build_new_group_table(from_conn, to_conn)
 
         # distribute the indices to new groups and batches
-        from_bins = [[np.empty(0, dtype=np.int64) for _ in g] for g in batch_info]
-        to_bins = [[np.empty(0, dtype=np.int64) for _ in g] for g in batch_info]
+        from_bins = [[[np.empty(0, dtype=np.int64)] for _ in g] for g in batch_info]
+        to_bins = [[[np.empty(0, dtype=np.int64)] for _ in g] for g in batch_info]
 
         for (igrp, ibatch), (_, from_batch) in _iterbatches(from_conn.groups):
             from_to_element_indices = actx.to_numpy(from_batch.to_element_indices)
@@ -239,12 +239,11 @@ def flatten_chained_connection(actx, connection):
                 jto = actx.to_numpy(to_batch.to_element_indices)
 
                 mask = np.isin(jfrom, from_to_element_indices)
-                from_bins[igrp_new][ibatch_new] = \
-                    np.hstack([from_bins[igrp_new][ibatch_new],
-                               el_table[igrp][jfrom[mask]]])
-                to_bins[igrp_new][ibatch_new] = \
-                    np.hstack([to_bins[igrp_new][ibatch_new],
-                               jto[mask]])
+                from_bins[igrp_new][ibatch_new].append(el_table[igrp][jfrom[mask]])
+                to_bins[igrp_new][ibatch_new].append(jto[mask])
+
+        from_bins = [[np.concatenate(b) for b in g] for g in from_bins]
+        to_bins = [[np.concatenate(b) for b in g] for g in to_bins]
 
         # build new groups
         groups = []
@@ -121,8 +121,8 @@ def _build_boundary_connection(actx, vol_discr, bdry_discr, connection_data,
 # {{{ pull together boundary vertices
 
 def _get_face_vertices(mesh: Mesh, boundary_tag: BoundaryTag) -> np.ndarray:
-    # a set of volume vertex numbers
-    bdry_vertex_vol_nrs = set()
+    # arrays of (possibly repeated) volume vertex numbers
+    bdry_vertex_vol_nrs = [np.empty(0, dtype=np.intp)]
 
     if boundary_tag in [FACE_RESTR_INTERIOR, FACE_RESTR_ALL]:
         # For FACE_RESTR_INTERIOR, this is likely every vertex in the book.
@@ -146,13 +146,14 @@ def _get_face_vertices(mesh: Mesh, boundary_tag: BoundaryTag) -> np.ndarray:
             for bdry_grp in matching_bdry_grps:
                 grp = mesh.groups[igrp]
                 for fvi in grp.face_vertex_indices():
-                    bdry_vertex_vol_nrs.update(
+                    bdry_vertex_vol_nrs.append(
                             grp.vertex_indices
                             [bdry_grp.elements]
                             [:, np.array(fvi, dtype=np.intp)]
-                            .flat)
+                            .ravel())
 
-        return np.array(sorted(bdry_vertex_vol_nrs), dtype=np.intp)
+        return np.unique(
+                np.concatenate(bdry_vertex_vol_nrs).astype(np.intp, copy=False))
 
         # }}}
 
@@ -73,21 +73,23 @@ def _build_interpolation_batches_for_group(
 
     num_children = len(record.el_tess_info.children) \
                    if record.el_tess_info else 0
-    from_bins = [[] for i in range(1 + num_children)]
-    to_bins = [[] for i in range(1 + num_children)]
-    for elt_idx, refinement_result in enumerate(record.element_mapping):
-        if len(refinement_result) == 1:
-            # Not refined -> interpolates to self
-            from_bins[0].append(elt_idx)
-            to_bins[0].append(refinement_result[0])
-        else:
-            assert len(refinement_result) == num_children
-            # Refined -> interpolates to children
-            for from_bin, to_bin, child_idx in zip(
-                    from_bins[1:], to_bins[1:], refinement_result,
-                    strict=True):
-                from_bin.append(elt_idx)
-                to_bin.append(child_idx)
+
+    # NOTE: the children of each element are numbered consecutively, so the
+    # bins can be built from the start of each range of children
+    child_element_starts = record.child_element_starts.astype(np.intp, copy=False)
+    nel_children = np.diff(child_element_starts)
+
+    # Not refined -> interpolates to self
+    unrefined_elements = np.flatnonzero(nel_children == 1)
+    from_bins = [unrefined_elements]
+    to_bins = [child_element_starts[unrefined_elements]]
+
+    # Refined -> interpolates to children
+    refined_elements = np.flatnonzero(nel_children != 1)
+    assert (nel_children[refined_elements] == num_children).all()
+    for child_idx in range(num_children):
+        from_bins.append(refined_elements)
+        to_bins.append(child_element_starts[refined_elements] + child_idx)
 
     fine_unit_nodes = fine_discr_group.unit_nodes
     fine_meg = fine_discr_group.mesh_el_group
@@ -102,12 +104,12 @@ def _build_interpolation_batches_for_group(
             to_bins,
             chain([fine_unit_nodes], mapped_unit_nodes),
             strict=True):
-        if not from_bin:
+        if not from_bin.size:
             continue
         yield InterpolationBatch(
             from_group_index=group_idx,
-            from_element_indices=actx.from_numpy(np.asarray(from_bin)),
-            to_element_indices=actx.from_numpy(np.asarray(to_bin)),
+            from_element_indices=actx.from_numpy(from_bin),
+            to_element_indices=actx.from_numpy(to_bin),
             result_unit_nodes=unit_nodes,
             to_element_face=None)
 
@@ -20,6 +20,8 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 THE SOFTWARE.
 """
 
+from functools import cache
+
 import numpy as np
 import numpy.linalg as la
 
@@ -32,45 +34,48 @@ __doc__ = """
 
 # {{{ Map between reference simplices
 
-def get_affine_reference_simplex_mapping(ambient_dim, firedrake_to_meshmode=True):
+@cache
+def _get_firedrake_unit_vertices(dim):
     """
-    Returns a function which takes a numpy array points
-    on one reference cell and maps each
-    point to another using a positive affine map.
-
-    :arg ambient_dim: The spatial dimension
-    :arg firedrake_to_meshmode: If true, the returned function maps from
-        the firedrake reference element to
-        meshmode, if false maps from
-        meshmode to firedrake. More specifically,
-        :mod:`firedrake` uses the standard :mod:`FIAT`
-        simplex and :mod:`meshmode` uses
-        :mod:`modepy`'s
-        `unit coordinates <https://documen.tician.de/modepy/nodes.html>`_.
-    :return: A function which takes a numpy array of *n* points with
-             shape *(dim, n)* on one reference cell and maps
-             each point to another using a positive affine map.
-             Note that the returned function performs
-             no input validation.
+    :returns: the vertices of the :mod:`FIAT` reference simplex, with shape
+        *(dim, nunit_vertices)*. The result is cached and must not be modified.
     """
-    # validate input
-    if not isinstance(ambient_dim, int):
-        raise TypeError("'ambient_dim' must be an int, not "
-                        f"'{type(ambient_dim)}'")
-    if ambient_dim < 0:
-        raise ValueError("'ambient_dim' must be non-negative")
-    if not isinstance(firedrake_to_meshmode, bool):
-        raise TypeError("'firedrake_to_meshmode' must be a bool, not "
-                        f"'{type(firedrake_to_meshmode)}'")
-
     from FIAT.reference_element import ufc_simplex
 
+    vertices = np.ascontiguousarray(np.array(ufc_simplex(dim).vertices).T)
+    vertices.flags.writeable = False
+
+    return vertices
+
+
+@cache
+def _get_modepy_unit_vertices(dim):
+    """
+    :returns: the vertices of the :mod:`modepy` reference simplex, with shape
+        *(dim, nunit_vertices)*. The result is cached and must not be modified.
+    """
     from modepy import Simplex, unit_vertices_for_shape
 
+    vertices = np.ascontiguousarray(unit_vertices_for_shape(Simplex(dim)))
+    vertices.flags.writeable = False
+
+    return vertices
+
+
+@cache
+def _get_affine_reference_simplex_mapping_data(ambient_dim, firedrake_to_meshmode):
+    """
+    :returns: a tuple *(mat, scale, shift)* describing the affine map
+        ``mat @ x + shift`` between the reference simplices (see
+        :func:`get_affine_reference_simplex_mapping`). *mat* is *None* if
+        the map is a pure shift. If *mat* is diagonal, *scale* holds its
+        diagonal as a column, otherwise it is *None*. The result is cached
+        and must not be modified.
+    """
     # Get the unit vertices from each system,
     # each stored with shape *(dim, nunit_vertices)*
-    firedrake_unit_vertices = np.array(ufc_simplex(ambient_dim).vertices).T
-    modepy_unit_vertices = unit_vertices_for_shape(Simplex(ambient_dim))
+    firedrake_unit_vertices = _get_firedrake_unit_vertices(ambient_dim)
+    modepy_unit_vertices = _get_modepy_unit_vertices(ambient_dim)
 
     if firedrake_to_meshmode:
         from_verts = firedrake_unit_vertices
@@ -86,10 +91,9 @@ def get_affine_reference_simplex_mapping(ambient_dim, firedrake_to_meshmode=True
 
     # If we only have one vertex, have A = I and b = to_vert - from_vert
     if nvects == 1:
+        mat = None
+        scale = None
         shift = to_verts[:, 0] - from_verts[:, 0]
-
-        def affine_map(points):
-            return points + shift[:, np.newaxis]
     # Otherwise, we have to solve for A and b
     else:
         # span verts: v1 - v0, v2 - v0, ...
@@ -100,14 +104,116 @@ def get_affine_reference_simplex_mapping(ambient_dim, firedrake_to_meshmode=True
         # A f0 + b -> t0 so b = t0 - A f0
         shift = to_verts[:, 0] - np.matmul(mat, from_verts[:, 0])
 
-        # Explicitly ensure A is positive
-        if la.det(mat) < 0:
-            from meshmode.mesh.processing import get_simplex_element_flip_matrix
-            flip_matrix = get_simplex_element_flip_matrix(1, to_verts)
-            mat = np.matmul(flip_matrix, mat)
+        # the maps between the FIAT and modepy reference simplices are a
+        # positive multiple of the identity, so no flip is ever needed
+        assert la.det(mat) > 0
+
+        mat = np.ascontiguousarray(mat)
+        mat.flags.writeable = False
+
+        # NOTE: the FIAT <-> modepy maps are a uniform scaling, which can be
+        # applied without going through a matmul
+        if np.array_equal(mat, np.diag(np.diag(mat))):
+            scale = np.ascontiguousarray(np.diag(mat)[:, np.newaxis])
+            scale.flags.writeable = False
+        else:
+            scale = None
+
+    shift = np.ascontiguousarray(shift[:, np.newaxis])
+    shift.flags.writeable = False
+
+    return mat, scale, shift
 
-        def affine_map(points):
-            return np.matmul(mat, points) + shift[:, np.newaxis]
+
+@cache
+def _get_single_affine_reference_simplex_mapping_data(
+        ambient_dim, firedrake_to_meshmode):
+    """
+    :returns: the same as :func:`_get_affine_reference_simplex_mapping_data`,
+        converted to single precision if that can be done exactly (the maps
+        between the reference simplices only have small rational entries),
+        or the double precision data otherwise.
+    """
+    data = _get_affine_reference_simplex_mapping_data(
+        ambient_dim, firedrake_to_meshmode)
+
+    single_data = tuple(
+        None if ary is None else ary.astype(np.float32)
+        for ary in data)
+    if not all(
+            ary is None or np.array_equal(ary, single_ary)
+            for ary, single_ary in zip(data, single_data, strict=True)):
+        return data
+
+    for ary in single_data:
+        if ary is not None:
+            ary.flags.writeable = False
+
+    return single_data
+
+
+def get_affine_reference_simplex_mapping(ambient_dim, firedrake_to_meshmode=True):
+    """
+    Returns a function which takes a numpy array points
+    on one reference cell and maps each
+    point to another using a positive affine map.
+
+    :arg ambient_dim: The spatial dimension
+    :arg firedrake_to_meshmode: If true, the returned function maps from
+        the firedrake reference element to
+        meshmode, if false maps from
+        meshmode to firedrake. More specifically,
+        :mod:`firedrake` uses the standard :mod:`FIAT`
+        simplex and :mod:`meshmode` uses
+        :mod:`modepy`'s
+        `unit coordinates <https://documen.tician.de/modepy/nodes.html>`_.
+    :return: A function which takes a numpy array of *n* points with
+             shape *(dim, n)* on one reference cell and maps
+             each point to another using a positive affine map.
+             Note that the returned function performs
+             no input validation. It also takes an optional *out*
+             array of shape *(dim, n)* into which the result is written
+             (and which is returned), so that callers may reuse one
+             buffer across many calls. Points of dtype
+             :class:`numpy.float32` are mapped in single precision and
+             the result is :class:`numpy.float32` as well. All other
+             points are mapped in double precision, so that, e.g., integer
+             points give a :class:`numpy.float64` result.
+    """
+    # validate input
+    if not isinstance(ambient_dim, int):
+        raise TypeError("'ambient_dim' must be an int, not "
+                        f"'{type(ambient_dim)}'")
+    if ambient_dim < 0:
+        raise ValueError("'ambient_dim' must be non-negative")
+    if not isinstance(firedrake_to_meshmode, bool):
+        raise TypeError("'firedrake_to_meshmode' must be a bool, not "
+                        f"'{type(firedrake_to_meshmode)}'")
+
+    double_data = _get_affine_reference_simplex_mapping_data(
+        ambient_dim, firedrake_to_meshmode)
+    dtype_to_data = {
+        np.dtype(np.float64): double_data,
+        np.dtype(np.float32): _get_single_affine_reference_simplex_mapping_data(
+            ambient_dim, firedrake_to_meshmode),
+        }
+
+    def affine_map(points, out=None):
+        # use the single precision data for single precision points, so that
+        # they do not get upcast
+        mat, scale, shift = dtype_to_data.get(points.dtype, double_data)
+
+        if mat is None:
+            return np.add(points, shift, out=out)
+
+        if scale is not None:
+            result = np.multiply(scale, points, out=out)
+        else:
+            result = np.matmul(mat, points, out=out)
+
+        # add the shift in place to avoid a second (dim, n) temporary
+        result += shift
+        return result
 
     return affine_map
 
@@ -159,8 +265,13 @@ def get_finat_element_unit_nodes(finat_element):
     # so to recover node *i* we need to evaluate *p_i* at the identity
     # function
     point_evaluators = finat_element._element.dual.nodes
-    unit_nodes = [p(lambda x: x) for p in point_evaluators]
-    return np.array(unit_nodes).T
+    dim = finat_element.cell.get_spatial_dimension()
+
+    unit_nodes = np.empty((dim, len(point_evaluators)), dtype=np.float64)
+    for i, p in enumerate(point_evaluators):
+        unit_nodes[:, i] = p(lambda x: x)
+
+    return unit_nodes
 
 # }}}
 
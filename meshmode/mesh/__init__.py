@@ -1581,41 +1581,86 @@ def _test_node_vertex_consistency(
 # {{{ vertex-based nodal adjacency
 
 def _compute_nodal_adjacency_from_vertices(mesh: Mesh) -> NodalAdjacency:
-    # FIXME Native code would make this faster
-
     if mesh.vertices is None:
         raise ValueError("unable to compute nodal adjacency without vertices")
 
     _, nvertices = mesh.vertices.shape
-    vertex_to_element: list[list[int]] = [[] for i in range(nvertices)]
+
+    # {{{ vertex to element map (CSR)
+
+    # flattened vertex indices of all elements, with the global element
+    # number of each entry
+    el_vertex_indices = [np.empty(0, dtype=mesh.vertex_id_dtype)]
+    el_vertex_elements = [np.empty(0, dtype=mesh.element_id_dtype)]
 
     for base_element_nr, grp in zip(mesh.base_element_nrs, mesh.groups, strict=True):
         if grp.vertex_indices is None:
             raise ValueError("unable to compute nodal adjacency without vertices")
 
-        for iel_grp in range(grp.nelements):
-            for ivertex in grp.vertex_indices[iel_grp]:
-                vertex_to_element[ivertex].append(base_element_nr + iel_grp)
+        el_vertex_indices.append(grp.vertex_indices.ravel())
+        el_vertex_elements.append(np.repeat(
+                np.arange(
+                    base_element_nr, base_element_nr + grp.nelements,
+                    dtype=mesh.element_id_dtype),
+                grp.vertex_indices.shape[1]))
 
-    element_to_element: list[set[int]] = [set() for i in range(mesh.nelements)]
-    for base_element_nr, grp in zip(mesh.base_element_nrs, mesh.groups, strict=True):
-        assert grp.vertex_indices is not None
+    el_vertex_indices_ary = np.concatenate(el_vertex_indices)
+    el_vertex_elements_ary = np.concatenate(el_vertex_elements)
 
-        for iel_grp in range(grp.nelements):
-            for ivertex in grp.vertex_indices[iel_grp]:
-                element_to_element[base_element_nr + iel_grp].update(
-                        vertex_to_element[ivertex])
+    # NOTE: the sort is stable, so the elements of each vertex stay in order
+    vertex_to_element_starts = np.zeros(nvertices + 1, dtype=np.intp)
+    np.cumsum(
+            np.bincount(el_vertex_indices_ary, minlength=nvertices),
+            out=vertex_to_element_starts[1:])
+    vertex_to_element = el_vertex_elements_ary[
+            np.argsort(el_vertex_indices_ary, kind="stable")]
 
-    for iel, neighbors in enumerate(element_to_element):
-        neighbors.remove(iel)
+    # }}}
+
+    # {{{ element to element map (CSR)
+
+    # NOTE: any two elements that share a vertex are neighbors, so each entry
+    # in the vertex to element map is paired up with all the entries (itself
+    # included) for the same vertex
+    nvertex_elements = np.diff(vertex_to_element_starts)
+    entry_vertices = np.repeat(
+            np.arange(nvertices, dtype=mesh.vertex_id_dtype), nvertex_elements)
+    entry_npairs = nvertex_elements[entry_vertices]
+    entry_pair_starts = np.cumsum(entry_npairs) - entry_npairs
+
+    pair_elements = np.repeat(vertex_to_element, entry_npairs)
+    pair_neighbors = vertex_to_element[
+            np.arange(np.sum(entry_npairs))
+            + np.repeat(
+                vertex_to_element_starts[entry_vertices] - entry_pair_starts,
+                entry_npairs)]
+
+    # every element is paired with itself once per vertex
+    is_not_self = pair_elements != pair_neighbors
+    pair_elements = pair_elements[is_not_self]
+    pair_neighbors = pair_neighbors[is_not_self]
+
+    # remove duplicate pairs (from elements sharing multiple vertices) by
+    # sorting packed (element, neighbor) keys, which also orders the pairs
+    # by element, as needed for the CSR layout
+    nelements = mesh.nelements
+    element_neighbor_keys = np.sort(
+            pair_elements.astype(np.int64) * nelements + pair_neighbors)
+    is_first = np.ones(len(element_neighbor_keys), dtype=bool)
+    is_first[1:] = element_neighbor_keys[1:] != element_neighbor_keys[:-1]
+    element_neighbor_keys = element_neighbor_keys[is_first]
+    elements, neighbors = np.divmod(element_neighbor_keys, nelements)
+
+    # }}}
 
-    lengths = [len(el_list) for el_list in element_to_element]
-    neighbors_starts = np.cumsum(
-            np.array([0, *lengths], dtype=mesh.element_id_dtype))
-    from pytools import flatten
-    neighbors_ary = np.array(
-            list(flatten(element_to_element)),
-            dtype=mesh.element_id_dtype)
+    # NOTE: the cumulative sum is accumulated directly into element_id_dtype,
+    # since a plain np.cumsum would upcast to the platform integer
+    neighbors_starts = np.zeros(nelements + 1, dtype=mesh.element_id_dtype)
+    np.cumsum(
+            np.bincount(elements, minlength=nelements),
+            dtype=mesh.element_id_dtype,
+            out=neighbors_starts[1:])
+    neighbors_ary = neighbors.astype(mesh.element_id_dtype)
 
     assert neighbors_starts[-1] == len(neighbors_ary)
 
@@ -1830,9 +1875,15 @@ def _compute_facial_adjacency_from_vertices(
                 (len(boundary_tags), len(bdry_elements)), False)
 
             if face_vertex_indices_to_tags is not None:
-                for i in range(len(bdry_elements)):
-                    ref_fvi = grp.face_vertex_indices()[bdry_element_faces[i]]
-                    fvi = frozenset(grp.vertex_indices[bdry_elements[i], ref_fvi])
+                grp_ref_fvis = grp.face_vertex_indices()
+                bdry_el_vertex_indices = grp.vertex_indices[bdry_elements].tolist()
+
+                for i, (iface, el_vertex_indices) in enumerate(zip(
+                        bdry_element_faces.tolist(), bdry_el_vertex_indices,
+                        strict=True)):
+                    fvi = frozenset(
+                            el_vertex_indices[iref_vertex]
+                            for iref_vertex in grp_ref_fvis[iface])
                     tags = face_vertex_indices_to_tags.get(fvi, None)
                     if tags is not None:
                         for tag in tags:
@@ -209,8 +209,8 @@ def _get_connected_parts(
     """
     self_part_index = part_id_to_part_index[self_part_id]
 
-    # This set is not used in a way that will cause nondeterminism.
-    connected_part_indices = set()
+    # part indices of the neighbors of all the interior faces (with repeats)
+    neighbor_part_indices = [np.empty(0, dtype=global_elem_to_part_elem.dtype)]
 
     for igrp, facial_adj_list in enumerate(mesh.facial_adjacency_groups):
         int_grps = [
@@ -227,12 +227,14 @@ def _get_connected_parts(
             neighbors_are_other = global_elem_to_part_elem[facial_adj.neighbors
                         + elem_base_j, 0] != self_part_index
 
-            connected_part_indices.update(
+            neighbor_part_indices.append(
                 global_elem_to_part_elem[
                     facial_adj.neighbors[
                         elements_are_self & neighbors_are_other]
                     + elem_base_j, 0])
 
+    connected_part_indices = np.unique(np.concatenate(neighbor_part_indices))
+
     result = tuple(
         part_id
         for part_id, part_index in part_id_to_part_index.items()
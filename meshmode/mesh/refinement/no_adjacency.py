@@ -34,6 +34,89 @@ from meshmode.mesh.refinement.utils import Refiner
 logger = logging.getLogger(__name__)
 
 
+def _get_vertex_pair_keys(vertex_pairs: np.ndarray) -> np.ndarray:
+    """
+    :arg vertex_pairs: an array of shape ``(..., 2)`` of global vertex indices.
+    :returns: an array of shape ``(...)`` of :class:`numpy.int64` keys, each
+        packing one pair of vertex indices into a single integer. The keys do
+        not depend on the order of the vertices in a pair.
+    """
+    vertex_pairs = vertex_pairs.astype(np.int64, copy=False)
+    assert (vertex_pairs < 2**32).all()
+
+    min_vertices = np.minimum(vertex_pairs[..., 0], vertex_pairs[..., 1])
+    max_vertices = np.maximum(vertex_pairs[..., 0], vertex_pairs[..., 1])
+
+    return (min_vertices << 32) | max_vertices
+
+
+def _lookup_or_number_midpoints(
+        known_keys: np.ndarray,
+        known_midpoints: np.ndarray,
+        keys: np.ndarray,
+        inew_vertex: int,
+        ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    :arg known_keys: a sorted array of vertex pair keys (see
+        :func:`_get_vertex_pair_keys`) whose midpoints already exist.
+    :arg known_midpoints: the global vertex indices of the midpoints of
+        *known_keys*.
+    :arg keys: an array of (possibly repeated) vertex pair keys.
+    :arg inew_vertex: the global vertex index of the next new vertex.
+
+    :returns: a tuple ``(midpoints, new_indices, known_keys, known_midpoints)``.
+        *midpoints* has the shape of *keys* and contains the global vertex
+        index of the midpoint of each pair. Midpoints that are not known yet
+        are numbered consecutively starting at *inew_vertex*, in order of the
+        first appearance of their pair in *keys*. *new_indices* contains the
+        flat index into *keys* of that first appearance for each new midpoint.
+        The updated *known_keys* and *known_midpoints* include the new
+        midpoints.
+    """
+    unique_keys, first_indices, unique_inverse = np.unique(
+            keys.ravel(), return_index=True, return_inverse=True)
+
+    # put the unique keys in order of first appearance
+    first_order = np.argsort(first_indices)
+    first_rank = np.empty_like(first_order)
+    first_rank[first_order] = np.arange(len(first_order))
+
+    unique_keys = unique_keys[first_order]
+    first_indices = first_indices[first_order]
+    unique_inverse = first_rank[unique_inverse]
+
+    # look up known midpoints
+    unique_midpoints = np.empty(len(unique_keys), dtype=known_midpoints.dtype)
+    unique_midpoints.fill(-1)
+
+    if len(known_keys):
+        key_indices = np.searchsorted(known_keys, unique_keys)
+        key_indices = np.minimum(key_indices, len(known_keys) - 1)
+        is_found = known_keys[key_indices] == unique_keys
+        unique_midpoints[is_found] = known_midpoints[key_indices[is_found]]
+
+    # number the remaining ones as new vertices
+    is_new = unique_midpoints < 0
+    nnew = np.count_nonzero(is_new)
+    unique_midpoints[is_new] = np.arange(inew_vertex, inew_vertex + nnew)
+
+    # and merge them into the (sorted) known midpoints
+    new_keys = unique_keys[is_new]
+    new_key_order = np.argsort(new_keys)
+    new_keys = new_keys[new_key_order]
+    new_key_indices = np.searchsorted(known_keys, new_keys)
+
+    known_keys = np.insert(known_keys, new_key_indices, new_keys)
+    known_midpoints = np.insert(
+            known_midpoints, new_key_indices,
+            unique_midpoints[is_new][new_key_order])
+
+    return (
+            unique_midpoints[unique_inverse].reshape(keys.shape),
+            first_indices[is_new],
+            known_keys, known_midpoints)
+
+
 class RefinerWithoutAdjacency(Refiner):
     """A refiner that may be applied to non-conforming
     :class:`meshmode.mesh.Mesh` instances. It does not generate adjacency
@@ -54,14 +137,14 @@ class RefinerWithoutAdjacency(Refiner):
     """
 
     def __init__(self, mesh):
-        self._current_mesh = mesh
-        self._previous_mesh = None
+        super().__init__(mesh)
         self.group_refinement_records = None
-        self.global_vertex_pair_to_midpoint = {}
 
-    def refine_uniformly(self):
-        flags = np.ones(self._current_mesh.nelements, dtype=bool)
-        return self.refine(flags)
+        # maps a pair of global vertex indices (packed into a single integer
+        # by _get_vertex_pair_keys) to the global index of their midpoint,
+        # stored as sorted keys and the corresponding midpoints
+        self._vertex_pair_keys = np.empty(0, dtype=np.int64)
+        self._vertex_pair_midpoints = np.empty(0, dtype=mesh.vertex_id_dtype)
 
     # {{{ refinement top-level
 
@@ -88,6 +171,7 @@ class RefinerWithoutAdjacency(Refiner):
             inew_vertex = mesh.nvertices
 
         from meshmode.mesh.refinement.tessellate import (
+            GroupRefinementRecord,
             get_group_midpoints,
             get_group_tessellated_nodes,
             get_group_tessellation_info,
@@ -109,22 +193,25 @@ class RefinerWithoutAdjacency(Refiner):
             child_el_indices[0] = 0
             child_el_indices[1:] = np.cumsum(nchild_elements)
 
-            unrefined_el_new_indices = child_el_indices[:-1][~grp_flags]
-            refining_el_old_indices, = np.where(grp_flags)
+            # old indices of the refining and unrefined elements, and the new
+            # indices of the unrefined elements
+            refining_el_old_indices = np.flatnonzero(grp_flags)
+            unrefined_el_old_indices = np.flatnonzero(~grp_flags)
+            unrefined_el_new_indices = child_el_indices[unrefined_el_old_indices]
 
             new_nelements = child_el_indices[-1]
 
+            # indices of the children of each refining element
+            refining_child_el_indices = (
+                    child_el_indices[refining_el_old_indices].reshape(-1, 1)
+                    + np.arange(nchildren))
+
             # }}}
 
-            from meshmode.mesh.refinement.tessellate import GroupRefinementRecord
             group_refinement_records.append(
                     GroupRefinementRecord(
                         el_tess_info=el_tess_info,
-                        element_mapping=[
-                            list(range(
-                                child_el_indices[iel],
-                                child_el_indices[iel]+nchild_elements[iel]))
-                            for iel in range(grp.nelements)]))
+                        child_element_starts=child_el_indices))
 
             # {{{ get new vertices together
 
@@ -139,49 +226,58 @@ class RefinerWithoutAdjacency(Refiner):
 
                 # copy over unchanged vertices
                 new_vertex_indices[unrefined_el_new_indices] = \
-                        grp.vertex_indices[~grp_flags]
-
-                for old_iel in refining_el_old_indices:
-                    new_iel_base = child_el_indices[old_iel]
-
-                    refining_vertices = np.empty(len(el_tess_info.ref_vertices),
+                        grp.vertex_indices[unrefined_el_old_indices]
+
+                # gather the global vertex pairs of the midpoints of all the
+                # refining elements at once
+                refining_vertex_pair_keys = _get_vertex_pair_keys(
+                        grp.vertex_indices[refining_el_old_indices][
+                            :, el_tess_info.midpoint_vertex_pairs])
+
+                # global vertex indices of the (second-order) reference
+                # vertices, with one row per refining element
+                nref_vertices = len(el_tess_info.ref_vertices)
+                refining_vertices = np.empty(
+                        (len(refining_el_old_indices), nref_vertices),
                         dtype=mesh.vertex_id_dtype)
-                    refining_vertices.fill(-17)
-
-                    # carry over old vertices
-                    refining_vertices[el_tess_info.orig_vertex_indices] = \
-                            grp.vertex_indices[old_iel]
-
-                    for imidpoint, (iref_midpoint, (v1, v2)) in enumerate(zip(
-                            el_tess_info.midpoint_indices,
-                            el_tess_info.midpoint_vertex_pairs,
-                            strict=True)):
+                refining_vertices.fill(-17)
 
-                        global_v1 = grp.vertex_indices[old_iel, v1]
-                        global_v2 = grp.vertex_indices[old_iel, v2]
+                # carry over old vertices
+                refining_vertices[:, el_tess_info.orig_vertex_indices] = \
+                        grp.vertex_indices[refining_el_old_indices]
 
-                        if global_v1 > global_v2:
-                            global_v1, global_v2 = global_v2, global_v1
+                # NOTE: midpoints shared by several refining elements are only
+                # looked up (and numbered, if new) once, in the same order in
+                # which a sweep over the elements would number them.
+                (refining_midpoints, new_midpoint_indices,
+                 self._vertex_pair_keys, self._vertex_pair_midpoints) = \
+                         _lookup_or_number_midpoints(
+                                 self._vertex_pair_keys,
+                                 self._vertex_pair_midpoints,
+                                 refining_vertex_pair_keys,
+                                 inew_vertex)
+                inew_vertex += len(new_midpoint_indices)
 
-                        try:
-                            global_midpoint = self.global_vertex_pair_to_midpoint[
-                                    global_v1, global_v2]
-                        except KeyError:
-                            global_midpoint = inew_vertex
-                            additional_vertices.append(
-                                    midpoints[old_iel][:, imidpoint])
-                            self.global_vertex_pair_to_midpoint[
-                                    global_v1, global_v2] = global_midpoint
-                            inew_vertex += 1
+                refining_vertices[:, el_tess_info.midpoint_indices] = \
+                        refining_midpoints
 
-                        refining_vertices[iref_midpoint] = global_midpoint
+                assert (refining_vertices >= 0).all()
 
-                    assert (refining_vertices >= 0).all()
-
-                    new_vertex_indices[new_iel_base:new_iel_base+nchildren] = \
-                            refining_vertices[el_tess_info.children]
+                # write the vertices of the children of all refining elements
+                new_vertex_indices[refining_child_el_indices] = \
+                        refining_vertices[:, el_tess_info.children]
 
                 assert (new_vertex_indices >= 0).all()
+
+                if len(new_midpoint_indices):
+                    # gather the coordinates of all new vertices at once: these
+                    # are the midpoints at the first appearance of each pair,
+                    # as indices into the flattened (element, midpoint) pairs
+                    grp_midpoints = np.stack(
+                            [midpoints[iel] for iel in refining_el_old_indices],
+                            axis=1).reshape(mesh.ambient_dim, -1)
+                    additional_vertices.append(
+                            grp_midpoints[:, new_midpoint_indices])
             else:
                 new_vertex_indices = None
 
@@ -196,15 +292,17 @@ class RefinerWithoutAdjacency(Refiner):
             new_nodes.fill(float("nan"))
 
             # copy over unchanged nodes
-            new_nodes[:, unrefined_el_new_indices] = grp.nodes[:, ~grp_flags]
+            new_nodes[:, unrefined_el_new_indices] = \
+                    grp.nodes[:, unrefined_el_old_indices]
 
             tessellated_nodes = get_group_tessellated_nodes(
                     grp, el_tess_info, refining_el_old_indices)
 
-            for old_iel in refining_el_old_indices:
-                new_iel_base = child_el_indices[old_iel]
-                new_nodes[:, new_iel_base:new_iel_base+nchildren, :] = \
-                        tessellated_nodes[old_iel]
+            if len(refining_el_old_indices):
+                # write the nodes of the children of all refining elements at once
+                new_nodes[:, refining_child_el_indices] = np.stack(
+                        [tessellated_nodes[iel] for iel in refining_el_old_indices],
+                        axis=1)
 
             assert (~np.isnan(new_nodes)).all()
 
@@ -218,18 +316,23 @@ class RefinerWithoutAdjacency(Refiner):
                     unit_nodes=grp.unit_nodes))
 
         if perform_vertex_updates:
-            new_vertices = np.empty(
-                    (mesh.ambient_dim, mesh.nvertices + len(additional_vertices)),
-                    mesh.vertices.dtype)
-            new_vertices[:, :mesh.nvertices] = mesh.vertices
-            new_vertices[:, mesh.nvertices:] = np.array(additional_vertices).T
+            new_vertices = np.concatenate(
+                    [mesh.vertices, *additional_vertices], axis=1,
+                    dtype=mesh.vertices.dtype)
+            assert new_vertices.shape[1] == inew_vertex
         else:
             new_vertices = None
 
+        # NOTE: the group arrays above are already allocated with the dtypes
+        # of the original mesh, so these are passed on to keep them as is
         from meshmode.mesh import make_mesh
-        new_mesh = make_mesh(new_vertices, new_el_groups, is_conforming=(
-            mesh.is_conforming
-            and (refine_flags.all() or (~refine_flags).all())))
+        new_mesh = make_mesh(new_vertices, new_el_groups,
+            vertex_id_dtype=mesh.vertex_id_dtype,
+            element_id_dtype=mesh.element_id_dtype,
+            face_id_dtype=mesh.face_id_dtype,
+            is_conforming=(
+                mesh.is_conforming
+                and (refine_flags.all() or (~refine_flags).all())))
 
         self.group_refinement_records = group_refinement_records
         self._current_mesh = new_mesh
@@ -239,11 +342,5 @@ class RefinerWithoutAdjacency(Refiner):
 
     # }}}
 
-    def get_current_mesh(self):
-        return self._current_mesh
-
-    def get_previous_mesh(self):
-        return self._previous_mesh
-
 
 # vim: foldmethod=marker
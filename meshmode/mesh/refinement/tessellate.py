@@ -26,11 +26,13 @@ THE SOFTWARE.
 
 import logging
 from dataclasses import dataclass
-from functools import singledispatch
+from functools import cache, singledispatch
+from itertools import combinations, pairwise
 
 import numpy as np
 
 import modepy as mp
+from pytools import memoize_method
 
 from meshmode.mesh import MeshElementGroup, ModepyElementGroup
 
@@ -51,9 +53,10 @@ class ElementTessellationInfo:
 
     .. attribute:: ref_vertices
 
-        A list of tuples (similar to :func:`modepy.node_tuples_for_space`)
-        for the reference element containing midpoints. This is equivalent
-        to a second-order equidistant element.
+        An array of shape ``(nref_vertices, dim)`` of node tuples (similar to
+        :func:`modepy.node_tuples_for_space`) for the reference element
+        containing midpoints. This is equivalent to a second-order
+        equidistant element.
 
     .. attribute:: orig_vertex_indices
 
@@ -67,16 +70,17 @@ class ElementTessellationInfo:
 
     .. attribute:: midpoint_vertex_pairs
 
-        A list of tuples ``(v1, v2)`` of indices into :attr:`orig_vertex_indices`
-        that give for each midpoint the two vertices on the same line.
+        An array of shape ``(nmidpoints, 2)`` of indices into
+        :attr:`orig_vertex_indices` that give for each midpoint the two
+        vertices on the same line.
     """
 
     children: np.ndarray
-    ref_vertices: list[tuple[int, ...]]
+    ref_vertices: np.ndarray
 
     orig_vertex_indices: np.ndarray | None = None
     midpoint_indices: np.ndarray | None = None
-    midpoint_vertex_pairs: list[tuple[int, int]] | None = None
+    midpoint_vertex_pairs: np.ndarray | None = None
 
 
 @dataclass(frozen=True)
@@ -87,14 +91,30 @@ class GroupRefinementRecord:
         An instance of :class:`ElementTessellationInfo` that describes the
         tessellation of a single element into multiple child elements.
 
-    .. attribute:: element_mapping
+    .. attribute:: child_element_starts
 
-        A mapping from the original elements to the refined child elements.
+        An array of shape ``(nelements + 1,)``, where *nelements* is the
+        number of original elements in the group. The children of the
+        original element ``iel`` are the refined elements
+        ``child_element_starts[iel]`` up to (but not including)
+        ``child_element_starts[iel + 1]``.
+
+    .. autoproperty:: element_mapping
     """
 
     el_tess_info: ElementTessellationInfo
-    # FIXME: This should really be a CSR data structure.
-    element_mapping: list[list[int]]
+    child_element_starts: np.ndarray
+
+    @property
+    @memoize_method
+    def element_mapping(self) -> list[list[int]]:
+        """A mapping from the original elements to the refined child elements,
+        as a list of child element indices for each original element. This is
+        built from :attr:`child_element_starts` on first access and cached.
+        """
+        return [
+            list(range(start, end))
+            for start, end in pairwise(self.child_element_starts.tolist())]
 
 
 @singledispatch
@@ -173,9 +193,9 @@ def _get_ref_midpoints(shape, ref_vertices):
 
     from pytools import add_tuples
     space = mp.space_for_shape(shape, 1)
-    orig_vertices = [
+    orig_vertices = {
             add_tuples(vt, vt) for vt in mp.node_tuples_for_space(space)
-            ]
+            }
     return [rv for rv in ref_vertices if rv not in orig_vertices]
 
 # }}}
@@ -190,7 +210,7 @@ def _get_group_midpoints_modepy(
     space = meg.space
 
     # get midpoints in reference coordinates
-    midpoints = -1 + np.array(_get_ref_midpoints(shape, el_tess_info.ref_vertices))
+    midpoints = -1 + el_tess_info.ref_vertices[el_tess_info.midpoint_indices]
 
     # resample midpoints to ambient coordinates
     resampling_mat = mp.resampling_matrix(
@@ -228,46 +248,61 @@ def _get_group_tessellated_nodes_modepy(
     ambient_dim = len(meg.nodes)
     nunit_nodes = len(meg.unit_nodes[0])
 
-    return {
-            el: resampled_unit_nodes[iel].reshape((ambient_dim, -1, nunit_nodes))
-            for iel, el in enumerate(elements)
-            }
+    resampled_unit_nodes = resampled_unit_nodes.reshape(
+            (len(elements), ambient_dim, len(el_tess_info.children), nunit_nodes))
+
+    return dict(zip(elements, resampled_unit_nodes, strict=True))
 
 
 @get_group_tessellation_info.register(ModepyElementGroup)
 def _get_group_tessellation_info_modepy(meg: ModepyElementGroup):
     shape = meg.shape
-    space = mp.space_for_shape(shape, 2)
+    space = mp.space_for_shape(shape, 1)
     assert type(space) == type(meg.space)       # noqa: E721
 
+    return _get_shape_tessellation_info(shape)
+
+
+@cache
+def _get_shape_tessellation_info(shape: mp.Shape) -> ElementTessellationInfo:
+    # NOTE: this only depends on the shape, so it is computed once and shared
+    # by all groups (and all refinement steps) with the same shape
+    space = mp.space_for_shape(shape, 2)
+
     ref_vertices = mp.node_tuples_for_space(space)
     ref_vertices_to_index = {rv: i for i, rv in enumerate(ref_vertices)}
 
     from pytools import add_tuples
     space = mp.space_for_shape(shape, 1)
-    assert type(space) == type(meg.space)  # noqa: E721
     orig_vertices = tuple(add_tuples(vt, vt) for vt in mp.node_tuples_for_space(space))
     orig_vertex_indices = [ref_vertices_to_index[vt] for vt in orig_vertices]
 
     midpoints = _get_ref_midpoints(shape, ref_vertices)
     midpoint_indices = [ref_vertices_to_index[mp] for mp in midpoints]
 
+    midpoints_set = set(midpoints)
     midpoint_to_vertex_pairs = {
             midpoint: (i, j)
-            for i, ivt in enumerate(orig_vertices)
-            for j, jvt in enumerate(orig_vertices)
+            for (i, ivt), (j, jvt) in combinations(enumerate(orig_vertices), 2)
             for midpoint in [_midpoint_tuples(ivt, jvt)]
-            if i < j and midpoint in midpoints
+            if midpoint in midpoints_set
             }
     # ensure order matches the one in midpoint_indices
     midpoint_vertex_pairs = [midpoint_to_vertex_pairs[m] for m in midpoints]
 
+    # NOTE: the result is cached and shared, so make sure it cannot be modified
+    def make_readonly(ary):
+        ary.flags.writeable = False
+        return ary
+
     return ElementTessellationInfo(
-            ref_vertices=ref_vertices,
-            children=np.array(mp.submesh_for_shape(shape, ref_vertices)),
-            orig_vertex_indices=np.array(orig_vertex_indices),
-            midpoint_indices=np.array(midpoint_indices),
-            midpoint_vertex_pairs=midpoint_vertex_pairs,
+            ref_vertices=make_readonly(np.array(ref_vertices)),
+            children=make_readonly(
+                np.array(mp.submesh_for_shape(shape, ref_vertices))),
+            orig_vertex_indices=make_readonly(np.array(orig_vertex_indices)),
+            midpoint_indices=make_readonly(np.array(midpoint_indices)),
+            midpoint_vertex_pairs=make_readonly(
+                np.array(midpoint_vertex_pairs).reshape(-1, 2)),
             )
 
 # }}}
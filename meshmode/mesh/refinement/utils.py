@@ -91,32 +91,37 @@ def map_unit_nodes_to_children(meg: MeshElementGroup,
 
 @map_unit_nodes_to_children.register(SimplexElementGroup)
 def _(meg: SimplexElementGroup, unit_nodes, el_tess_info):
-    ref_vertices = np.array(el_tess_info.ref_vertices, dtype=np.float64).T
+    ref_vertices = el_tess_info.ref_vertices.T.astype(np.float64)
     assert len(unit_nodes.shape) == 2
 
+    # unit nodes on [0, 1]
+    scaled_unit_nodes = (unit_nodes + 1.0) / 2.0
+
     for child in el_tess_info.children:
         origin = ref_vertices[:, child[0]].reshape(-1, 1)
         basis = ref_vertices[:, child[1:]] - origin
 
         # mapped nodes are on [0, 2], so we subtract 1 to get it to [-1, 1]
-        yield basis.dot((unit_nodes + 1.0) / 2.0) + origin - 1.0
+        yield basis.dot(scaled_unit_nodes) + origin - 1.0
 
 
 @map_unit_nodes_to_children.register(TensorProductElementGroup)
 def _(meg: TensorProductElementGroup, unit_nodes, el_tess_info):
-    ref_vertices = np.array(el_tess_info.ref_vertices, dtype=np.float64).T
+    ref_vertices = el_tess_info.ref_vertices.T.astype(np.float64)
     assert len(unit_nodes.shape) == 2
 
     # NOTE: nodes indices in the unit hypercube that form the `e_i` basis
     basis_indices = 2**np.arange(meg.dim)
 
+    # unit nodes on [0, 1]
+    scaled_unit_nodes = (unit_nodes + 1.0) / 2.0
+
     for child in el_tess_info.children:
-        child_arr = np.array(child)
-        origin = ref_vertices[:, child_arr[0]].reshape(-1, 1)
-        basis = ref_vertices[:, child_arr[basis_indices]] - origin
+        origin = ref_vertices[:, child[0]].reshape(-1, 1)
+        basis = ref_vertices[:, child[basis_indices]] - origin
 
         # mapped nodes are on [0, 2], so we subtract 1 to get it to [-1, 1]
-        yield basis.dot((unit_nodes + 1.0) / 2.0) + origin - 1.0
+        yield basis.dot(scaled_unit_nodes) + origin - 1.0
 
 # }}}
 
@@ -128,8 +133,9 @@ def is_symmetric(relation, debug=False):
         for b in other_list:
             if a not in relation[b]:
                 if debug:
-                    print("Relation is not symmetric: %s -> %s, but not %s -> %s"
-                            % (a, b, b, a))
+                    logger.debug(
+                            "relation is not symmetric: %s -> %s, but not %s -> %s",
+                            a, b, b, a)
                 return False
 
     return True
@@ -145,18 +151,18 @@ def check_nodal_adj_against_geometry(mesh, tol=1e-12):
     logger.debug("nodal adj test: tree build done")
 
     nadj = mesh.nodal_adjacency
-    nvertices_per_element = len(mesh.groups[0].vertex_indices[0])
+    ambient_dim = mesh.vertices.shape[0]
 
-    connected_to_element_geometry = [set() for i in range(mesh.nelements)]
-    connected_to_element_connectivity = [set() for i in range(mesh.nelements)]
+    nb_starts = nadj.neighbors_starts.tolist()
+    nbs = nadj.neighbors.tolist()
+    connected_to_element_connectivity = [
+            set(nbs[nb_starts[iel_g]:nb_starts[iel_g + 1]])
+            for iel_g in range(mesh.nelements)]
+
+    connected_to_element_geometry = [set() for _ in range(mesh.nelements)]
 
     for igrp, grp in enumerate(mesh.groups):
         for iel_grp in range(grp.nelements):
-            iel_g = group_and_iel_to_global_iel(igrp, iel_grp)
-            nb_starts = nadj.neighbors_starts
-            for nb_iel_g in nadj.neighbors[nb_starts[iel_g]:nb_starts[iel_g+1]]:
-                connected_to_element_connectivity[iel_g].add(nb_iel_g)
-
             for vertex_index in grp.vertex_indices[iel_grp]:
                 vertex = mesh.vertices[:, vertex_index]
 
@@ -169,7 +175,7 @@ def check_nodal_adj_against_geometry(mesh, tol=1e-12):
                     nearby_origin_vertex = mesh.vertices[
                             :, nearby_grp.vertex_indices[nearby_iel][0]]
                     transformation = np.empty(
-                            (len(mesh.vertices), nvertices_per_element-1))
+                            (ambient_dim, nearby_grp.vertex_indices.shape[1]-1))
                     vertex_transformed = vertex - nearby_origin_vertex
 
                     for inearby_vertex_index, nearby_vertex_index in enumerate(
@@ -291,6 +291,39 @@ def test_from_boundary_consistency(actx_factory,
 # }}}
 
 
+# {{{ Reference cell mapping checks
+
+@pytest.mark.parametrize("dim", [1, 2, 3])
+@pytest.mark.parametrize("firedrake_to_meshmode", [True, False])
+def test_affine_reference_simplex_mapping(dim, firedrake_to_meshmode):
+    """
+    Check that the reference cell map gives the same result for single
+    precision points and when writing into an *out* array.
+    """
+    pytest.importorskip("FIAT")
+
+    from meshmode.interop.firedrake.reference_cell import (
+        get_affine_reference_simplex_mapping,
+    )
+    affine_map = get_affine_reference_simplex_mapping(dim, firedrake_to_meshmode)
+
+    rng = np.random.default_rng(seed=42)
+    points = rng.random((dim, 16))
+    result = affine_map(points)
+    assert result.dtype == np.float64
+
+    single_result = affine_map(points.astype(np.float32))
+    assert single_result.dtype == np.float32
+    assert np.allclose(single_result, result, rtol=1.0e-6, atol=1.0e-6)
+
+    buf = np.empty_like(points)
+    out_result = affine_map(points, out=buf)
+    assert out_result is buf
+    assert np.array_equal(out_result, result)
+
+# }}}
+
+
 # {{{ Boundary tags checking
 
 @pytest.mark.parametrize(
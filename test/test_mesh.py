@@ -522,6 +522,26 @@ def test_quad_single_element(visualize=False):
                 mg.nodes[1].reshape(-1), "o")
         plt.show()
 
+
+def test_single_element_nodal_adjacency():
+    vertices = np.array([
+                [0.0, 0.0],
+                [1.0, 0.0],
+                [0.0, 1.0],
+                ]).T
+    mg = mgen.make_group_from_vertices(
+            vertices,
+            np.array([[0, 1, 2]], dtype=np.int32),
+            1, group_cls=SimplexElementGroup)
+
+    mesh = make_mesh(vertices, [mg], is_conforming=True)
+    nodal_adjacency = mesh.nodal_adjacency
+
+    assert np.array_equal(nodal_adjacency.neighbors_starts, [0, 0])
+    assert nodal_adjacency.neighbors_starts.dtype == mesh.element_id_dtype
+    assert len(nodal_adjacency.neighbors) == 0
+    assert nodal_adjacency.neighbors.dtype == mesh.element_id_dtype
+
 # }}}
 
 
@@ -267,6 +267,26 @@ def test_uniform_refinement(group_cls, with_adjacency):
     mesh = refine_uniformly(mesh, 1, with_adjacency=with_adjacency)
 
 
+def test_refinement_keeps_id_dtypes():
+    from dataclasses import replace
+
+    from meshmode.mesh import make_mesh
+
+    mesh = mgen.generate_regular_rect_mesh(
+            a=(0.0, 0.0), b=(1.0, 1.0), nelements_per_axis=(3, 3))
+    mesh = make_mesh(mesh.vertices, [
+        replace(grp, vertex_indices=grp.vertex_indices.astype(np.int64))
+        for grp in mesh.groups
+        ], vertex_id_dtype=np.int64, element_id_dtype=np.int64)
+
+    refiner = RefinerWithoutAdjacency(mesh)
+    new_mesh = refiner.refine_uniformly()
+
+    assert new_mesh.vertex_id_dtype == mesh.vertex_id_dtype
+    assert new_mesh.element_id_dtype == mesh.element_id_dtype
+    assert new_mesh.groups[0].vertex_indices.dtype == mesh.vertex_id_dtype
+
+
 @pytest.mark.parametrize("refinement_rounds", [0, 1, 2])
 def test_conformity_of_uniform_mesh(refinement_rounds):
     mesh = mgen.generate_sphere(r=1.0, order=4,